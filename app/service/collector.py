@@ -2,7 +2,9 @@
 """
 Collector
 
-Triggered by EventBridge rule.
+Triggered by an SQS queue that the EventBridge collector rule delivers to, so
+one invocation receives a batch of up to 25 events. An EventBridge event passed
+in directly is handled as a batch of one.
 
 EventBridge sends events that include:
 
@@ -12,79 +14,254 @@ EventBridge sends events that include:
 Collector:
   - Ignores events without detail.testRunId (not part of an integration test run).
   - Loads run meta (run#meta) to ensure the run exists.
-  - Stores the full EventBridge event into S3 using a time-based path.
-  - Writes observed event record to DynamoDB with:
+  - Stores the full EventBridge event into S3 (gzip) using a time-based path.
+  - Writes observed event records to DynamoDB (one BatchWriteItem per batch) with:
     - pk: run#{testRunId}
     - sk: event#{timestamp}-{eventId}
     - detailType, source, payloadHash, rawS3Key, receivedAt
+  - Bumps observedCount on run#meta by the number of records written per run,
+    so the Verifier's status polls can read the count with a single GetItem.
 
 This keeps Collector lightweight and fast - just raw archival.
 No matching logic, no status updates, no knowledge of expectations.
 """
 
+import gzip
 import hashlib
-import json
+import logging
 import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import boto3
+from botocore.config import Config
+
+import json_utils
 
 TABLE_NAME = os.environ["TABLE_NAME"]
 S3_BUCKET = os.environ["S3_BUCKET"]
 
-dynamodb = boto3.resource("dynamodb")
-table = dynamodb.Table(TABLE_NAME)
-s3 = boto3.client("s3")
+logger = logging.getLogger()
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
+
+# Low-level clients skip the resource layer; keep-alive and a pool sized to the
+# executor let warm invocations reuse TLS connections.
+_client_config = Config(
+    tcp_keepalive=True,
+    max_pool_connections=10,
+    retries={"mode": "standard", "max_attempts": 3},
+)
+ddb = boto3.client("dynamodb", config=_client_config)
+s3 = boto3.client("s3", config=_client_config)
+
+BATCH_WRITE_SIZE = 25
+BATCH_WRITE_MAX_RETRIES = 5
+
+# S3 archival runs on worker threads while the batch is written to DynamoDB
+_executor = ThreadPoolExecutor(max_workers=10)
 
+# How long a warm container trusts that a run's meta item exists.
+RUN_META_CACHE_TTL_SECONDS = 60
+RUN_META_CACHE_MAX_ENTRIES = 1024
 
-def _now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat(timespec="seconds") + "Z"
+# testRunId -> time.monotonic() at which run#meta was last seen
+_run_meta_seen = {}
+
+
+def _hash_payload_bytes(buf: bytes) -> str:
+    return hashlib.sha256(buf).hexdigest()
 
 
 def _hash_payload(payload) -> str:
     try:
-        return hashlib.sha256(
-            json.dumps(payload, sort_keys=True).encode("utf-8")
-        ).hexdigest()
+        return _hash_payload_bytes(json_utils.dumps(payload, sort_keys=True))
     except Exception:
         return ""
 
 
-def _store_event_payload(test_run_id: str, event_id: str, full_event: dict) -> str:
+def _event_payload_key(test_run_id: str, event_id: str, now_iso: str) -> str:
     """
-    Store the full EventBridge event in S3 and return the key.
+    Build the S3 key for an archived event from a UTC isoformat() timestamp.
 
     Path layout (time-based hierarchy):
 
-      events/testruns/{testRunId}/{YYYY}/{MM}/{DD}/{timestamp}-{eventId}.json
+      events/testruns/{testRunId}/{YYYY}/{MM}/{DD}/{timestamp}-{eventId}.json.gz
     """
-    now = datetime.now(timezone.utc)
-    yyyy = now.strftime("%Y")
-    mm = now.strftime("%m")
-    dd = now.strftime("%d")
-    ts = now.strftime("%Y-%m-%dT%H-%M-%SZ")
+    yyyy, mm, dd = now_iso[:4], now_iso[5:7], now_iso[8:10]
+    ts = now_iso[:19].replace(":", "-") + "Z"  # 2025-11-21T10-15-32Z
 
-    key = f"events/testruns/{test_run_id}/{yyyy}/{mm}/{dd}/{ts}-{event_id}.json"
+    return f"events/testruns/{test_run_id}/{yyyy}/{mm}/{dd}/{ts}-{event_id}.json.gz"
 
+
+def _store_event_payload(key: str, body: bytes) -> str:
+    """
+    Store the already-serialized EventBridge event in S3, gzip-compressed.
+    Returns the key, or "" if the upload failed.
+    """
     try:
         s3.put_object(
             Bucket=S3_BUCKET,
             Key=key,
-            Body=json.dumps(full_event).encode("utf-8"),
+            # Level 1: archival is on the hot path, so favour speed over ratio
+            Body=gzip.compress(body, compresslevel=1),
+            ContentEncoding="gzip",
+            ContentType="application/json",
         )
         return key
     except Exception as e:
-        print(f"[Collector] Failed to store event payload to S3: {e}")
+        logger.error("Failed to store event payload to S3: %s", e)
         return ""
 
 
+def _event_record_av(item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    DynamoDB AttributeValue map for an event record. The record has a fixed shape
+    of string attributes, so it is built directly instead of via TypeSerializer.
+    """
+    payload_hash = item["payloadHash"]
+    return {
+        "testId": {"S": item["testId"]},
+        "sk": {"S": item["sk"]},
+        "testRunId": {"S": item["testRunId"]},
+        "eventId": {"S": item["eventId"]},
+        "detailType": {"S": item["detailType"]},
+        "source": {"S": item["source"]},
+        "payloadHash": {"S": payload_hash} if payload_hash else {"NULL": True},
+        "rawS3Key": {"S": item["rawS3Key"]},
+        "receivedAt": {"S": item["receivedAt"]},
+    }
+
+
+def _event_key(event_item: Dict[str, Any]) -> Dict[str, Any]:
+    return {"testId": {"S": event_item["testId"]}, "sk": {"S": event_item["sk"]}}
+
+
 def _get_run_meta(test_run_id: str):
-    resp = table.get_item(Key={"testId": f"run#{test_run_id}", "sk": "run#meta"})
+    resp = ddb.get_item(
+        TableName=TABLE_NAME,
+        Key={"testId": {"S": f"run#{test_run_id}"}, "sk": {"S": "run#meta"}},
+        ProjectionExpression="testId",
+    )
     return resp.get("Item")
 
 
-def handler(event, context):
+def _batch_write_items(items: List[Dict[str, Any]]) -> Set[Tuple[str, str]]:
+    """
+    Put event records with BatchWriteItem, 25 per request, resending UnprocessedItems
+    with exponential backoff. Items sharing a key are collapsed, last one wins.
+
+    Returns the (testId, sk) keys that could not be written. Records that did
+    land must not be redelivered, or they would be stored again under a new sk.
+    """
+    unique = {(i["testId"], i["sk"]): i for i in items}
+    requests = [{"PutRequest": {"Item": _event_record_av(i)}} for i in unique.values()]
+    failed = set()
+
+    for start in range(0, len(requests), BATCH_WRITE_SIZE):
+        chunk = requests[start : start + BATCH_WRITE_SIZE]
+        attempt = 0
+        try:
+            while chunk:
+                resp = ddb.batch_write_item(RequestItems={TABLE_NAME: chunk})
+                chunk = resp.get("UnprocessedItems", {}).get(TABLE_NAME, [])
+                if not chunk:
+                    break
+                attempt += 1
+                if attempt > BATCH_WRITE_MAX_RETRIES:
+                    logger.error("%d event records left unprocessed", len(chunk))
+                    break
+                time.sleep(0.05 * 2**attempt)
+        except Exception as e:
+            logger.error("Failed to store event records: %s", e)
+
+        for request in chunk:
+            item = request["PutRequest"]["Item"]
+            failed.add((item["testId"]["S"], item["sk"]["S"]))
+
+    return failed
+
+
+def _add_observed_counts(items: List[Dict[str, Any]]) -> None:
+    """
+    ADD the number of distinct event records written for each run to its
+    run#meta observedCount. A failed increment is only logged: the records are
+    already stored, and redelivering the messages would write them twice.
+    """
+    counts = Counter(pk for pk, _ in {(i["testId"], i["sk"]) for i in items})
+    for pk, n in counts.items():
+        try:
+            ddb.update_item(
+                TableName=TABLE_NAME,
+                Key={"testId": {"S": pk}, "sk": {"S": "run#meta"}},
+                UpdateExpression="ADD observedCount :n",
+                ConditionExpression="attribute_exists(testId)",
+                ExpressionAttributeValues={":n": {"N": str(n)}},
+            )
+        except Exception as e:
+            logger.error("Failed to update observedCount for %s: %s", pk, e)
+
+
+def _run_exists(test_run_id: str) -> bool:
+    """
+    Return True if run#meta exists for this test run.
+
+    Hits are cached for RUN_META_CACHE_TTL_SECONDS so a burst of events for the
+    same run only pays for one GetItem. Misses are not cached, so a run whose
+    meta is written after its first event is still picked up.
+    """
+    now = time.monotonic()
+    seen_at = _run_meta_seen.get(test_run_id)
+    if seen_at is not None and now - seen_at < RUN_META_CACHE_TTL_SECONDS:
+        return True
+
+    if not _get_run_meta(test_run_id):
+        return False
+
+    # Crude bound for long-lived containers; runs are short so a reset is cheap
+    if len(_run_meta_seen) >= RUN_META_CACHE_MAX_ENTRIES:
+        _run_meta_seen.clear()
+    _run_meta_seen[test_run_id] = now
+    return True
+
+
+def _prewarm_connections() -> None:
     """
+    Open the DynamoDB and S3 connections during Lambda init, so the first batch
+    does not pay for the TLS handshake. Uses calls the role already allows;
+    failures only mean the first real call warms up instead.
+    """
+    try:
+        _get_run_meta("prewarm")
+        s3.head_bucket(Bucket=S3_BUCKET)
+    except Exception as e:
+        logger.debug("Connection pre-warm failed: %s", e)
+
+
+_prewarm_connections()
+
+
+def _parse_record(
+    record: Optional[Dict[str, Any]], event: Dict[str, Any]
+) -> Tuple[Dict[str, Any], bytes]:
+    """
+    Return (EventBridge event, serialized event) for one SQS record, or for the
+    invocation event itself when record is None. SQS bodies are archived as
+    received, so the stored payload is exactly what EventBridge delivered.
+    """
+    if record is None:
+        return event, json_utils.dumps(event)
+    body = record["body"]
+    return json_utils.loads(body), body.encode("utf-8")
+
+
+def _build_event_item(event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Build the observed event record for one EventBridge event, or return None if
+    the event does not belong to an active test run.
+
     EventBridge event shape (simplified):
 
       {
@@ -99,61 +276,148 @@ def handler(event, context):
         ...
       }
     """
-    print(f"[Collector] EventBridge event: {json.dumps(event)}")
+    # Lazy %-formatting: the event is only rendered when DEBUG is enabled
+    logger.debug("EventBridge event: %s", event)
 
     detail = event.get("detail") or {}
 
     # Only handle events that belong to a test run
     test_run_id = detail.get("testRunId")
     if not test_run_id:
-        print("[Collector] No testRunId in event.detail, ignoring.")
-        return {"ignored": True, "reason": "no_testRunId"}
+        logger.info("No testRunId in event.detail, ignoring.")
+        return None
 
-    run_meta = _get_run_meta(test_run_id)
-    if not run_meta:
-        print(f"[Collector] No run meta found for testRunId={test_run_id}, ignoring.")
-        return {"ignored": True, "reason": "no_run_meta", "testRunId": test_run_id}
+    if not _run_exists(test_run_id):
+        logger.info("No run meta found for testRunId=%s, ignoring.", test_run_id)
+        return None
 
     event_id = event.get("id", "")
-    detail_type = event.get("detail-type", "")
-    source = event.get("source", "")
 
-    # Store full payload in S3 first (time-based path)
-    s3_key = _store_event_payload(test_run_id, event_id, event)
+    # One clock read per event; the S3 key, sort key and receivedAt are sliced
+    # from it.
+    # e.g. 2025-11-21T10:15:32.123456+00:00
+    now_iso = datetime.now(timezone.utc).isoformat(timespec="microseconds")
+
+    s3_key = _event_payload_key(test_run_id, event_id, now_iso)
     payload_hash = _hash_payload(detail)
-    received_at = _now_iso()
+    received_at = now_iso[:19] + "Z"  # 2025-11-21T10:15:32Z
 
     # Generate sort key: event#{timestamp}-{eventId}
-    # Use microsecond precision for uniqueness
-    now = datetime.now(timezone.utc)
-    timestamp_str = now.strftime("%Y%m%dT%H%M%S.%f")[:-3]  # milliseconds
+    # Use millisecond precision for uniqueness, e.g. 20251121T101532.123
+    timestamp_str = now_iso[:23].replace("-", "").replace(":", "")
     sk = f"event#{timestamp_str}-{event_id}"
 
-    # Write observed event record to DynamoDB
-    event_item = {
+    return {
         "testId": f"run#{test_run_id}",
         "sk": sk,
         "testRunId": test_run_id,
         "eventId": event_id,
-        "detailType": detail_type,
-        "source": source,
+        "detailType": event.get("detail-type", ""),
+        "source": event.get("source", ""),
         "payloadHash": payload_hash or None,
-        "rawS3Key": s3_key or None,
+        "rawS3Key": s3_key,
         "receivedAt": received_at,
     }
 
-    try:
-        table.put_item(Item=event_item)
-        print(
-            f"[Collector] Stored event record for testRunId={test_run_id}, "
-            f"detailType={detail_type}, source={source}"
+
+def handler(event, context):
+    """
+    SQS batch shape (simplified), each body being one EventBridge event:
+
+      {
+        "Records": [
+          { "messageId": "...", "body": "{\"id\": \"...\", \"detail\": {...}}" },
+          ...
+        ]
+      }
+
+    Failed records are reported back through batchItemFailures so SQS only
+    redelivers those messages.
+    """
+    pending = []  # (messageId, event record, S3 upload future)
+    rejected = []  # messageIds that could not be parsed or checked
+    ignored = 0
+
+    # An EventBridge event passed in directly is handled as a batch of one
+    records = event.get("Records")
+    if records is None:
+        records = [None]
+
+    for record in records:
+        message_id = record.get("messageId") if record else None
+        try:
+            eb_event, raw_event = _parse_record(record, event)
+            event_item = _build_event_item(eb_event)
+        except Exception as e:
+            if record is None:
+                raise
+            # One bad body or a transient run#meta lookup error only fails its message
+            logger.error("Failed to process message %s: %s", message_id, e)
+            rejected.append(message_id)
+            continue
+
+        if event_item is None:
+            ignored += 1
+            continue
+
+        # Archive the full event to S3 while the batch is assembled and written
+        s3_future = _executor.submit(
+            _store_event_payload, event_item["rawS3Key"], raw_event
+        )
+        pending.append((message_id, event_item, s3_future))
+
+    if not pending:
+        return {
+            "stored": 0,
+            "ignored": ignored,
+            "batchItemFailures": [
+                {"itemIdentifier": message_id} for message_id in rejected if message_id
+            ],
+        }
+
+    failed_keys = _batch_write_items([event_item for _, event_item, _ in pending])
+    stored, failed = [], []
+    for entry in pending:
+        event_item = entry[1]
+        if (event_item["testId"], event_item["sk"]) in failed_keys:
+            failed.append(entry)
+        else:
+            stored.append(entry)
+    wait([f for _, _, f in failed])
+
+    for _, event_item, s3_future in stored:
+        logger.info(
+            "Stored event record for testRunId=%s, detailType=%s, source=%s",
+            event_item["testRunId"],
+            event_item["detailType"],
+            event_item["source"],
         )
-    except Exception as e:
-        print(f"[Collector] Failed to store event record: {e}")
-        return {"testRunId": test_run_id, "stored": False, "error": str(e)}
 
-    return {
-        "testRunId": test_run_id,
-        "stored": True,
-        "eventKey": {"testId": f"run#{test_run_id}", "sk": sk},
+        # The record was written with rawS3Key up front; drop it if the upload failed
+        if not s3_future.result():
+            try:
+                ddb.update_item(
+                    TableName=TABLE_NAME,
+                    Key=_event_key(event_item),
+                    UpdateExpression="REMOVE rawS3Key",
+                )
+            except Exception as e:
+                logger.error("Failed to clear rawS3Key on event record: %s", e)
+
+    # Counted only once every payload is settled: status mode reports "ready"
+    # from this count, and verify reads the archived bodies straight away
+    _add_observed_counts([event_item for _, event_item, _ in stored])
+
+    result = {
+        "stored": len(stored),
+        "ignored": ignored,
+        # Only messages that were rejected or not written are redelivered
+        "batchItemFailures": [
+            {"itemIdentifier": message_id}
+            for message_id in rejected + [m for m, _, _ in failed]
+            if message_id
+        ],
     }
+    if failed:
+        result["error"] = f"{len(failed)} event records could not be stored"
+    return result
@@ -0,0 +1,55 @@
+# app/service/json_utils.py
+"""
+JSON helpers shared by the harness Lambdas.
+
+orjson is used for speed, but it does not keep integers wider than 64 bits:
+orjson.loads quietly turns them into floats and orjson.dumps refuses them.
+Event payloads, fixtures and DynamoDB numbers (up to 38 digits) can carry such
+values, so both directions fall back to the stdlib json module, which keeps
+them exact.
+"""
+
+import json
+import re
+from typing import Any, Callable, Optional, Union
+
+import orjson
+
+# A run of 19+ digits may be an integer outside orjson's 64-bit range. Matches
+# inside strings or long fractions only cost a slower, still exact, parse.
+_LONG_DIGITS = re.compile(rb"[0-9]{19}")
+_LONG_DIGITS_STR = re.compile(r"[0-9]{19}")
+
+
+def loads(raw: Union[bytes, str]) -> Any:
+    """Parse JSON, using stdlib json when the document may hold a wide integer."""
+    pattern = _LONG_DIGITS_STR if isinstance(raw, str) else _LONG_DIGITS
+    if pattern.search(raw):
+        return json.loads(raw)
+    return orjson.loads(raw)
+
+
+def dumps(
+    obj: Any,
+    sort_keys: bool = False,
+    indent: bool = False,
+    default: Optional[Callable[[Any], Any]] = None,
+) -> bytes:
+    """
+    Serialize to UTF-8 JSON bytes: compact, or with a 2-space indent. Output is
+    the same whichever encoder runs, so hashes over it stay stable.
+    """
+    option = (orjson.OPT_SORT_KEYS if sort_keys else 0) | (
+        orjson.OPT_INDENT_2 if indent else 0
+    )
+    try:
+        return orjson.dumps(obj, default=default, option=option or None)
+    except orjson.JSONEncodeError:
+        return json.dumps(
+            obj,
+            sort_keys=sort_keys,
+            indent=2 if indent else None,
+            separators=(",", ": ") if indent else (",", ":"),
+            ensure_ascii=False,
+            default=default,
+        ).encode("utf-8")
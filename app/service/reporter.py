@@ -19,28 +19,119 @@ Reporter Lambda:
   - Returns report key (and basic summary).
 """
 
-import json
+import gzip
 import logging
 import os
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from decimal import Decimal
+from html import escape
+from typing import Any, Dict, Iterator, List, Optional
 
 import boto3
-from boto3.dynamodb.conditions import Key, Attr
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+import json_utils
+
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 TABLE_NAME = os.environ["TABLE_NAME"]
 S3_BUCKET = os.environ["S3_BUCKET"]
 
-dynamodb = boto3.resource("dynamodb")
-table = dynamodb.Table(TABLE_NAME)
-s3_client = boto3.client("s3")
+# Keep-alive so the meta/event reads and the report upload share connections
+_client_config = Config(
+    tcp_keepalive=True,
+    max_pool_connections=10,
+    retries={"mode": "standard", "max_attempts": 3},
+)
+ddb = boto3.client("dynamodb", config=_client_config)
+s3_client = boto3.client("s3", config=_client_config)
+
+_deserializer = TypeDeserializer()
+
+# Run meta, the event queries and the template fetch are independent reads
+_executor = ThreadPoolExecutor(max_workers=4)
 
 
 TEMPLATE_KEY = "reports/templates/base.html"
+# S3 template body and ETag, kept across warm invocations
+_template_cache: Dict[str, Optional[str]] = {"body": None, "etag": None}
+_PLACEHOLDER_RE = re.compile(r"\{\{ (\w+) \}\}")
+
+# Simple template with the same placeholders, used when none is in S3
+_FALLBACK_TEMPLATE = """\
+<html>
+  <head>
+    <title>Integration Test Report - {{ testRunId }}</title>
+    <style>
+      body { font-family: Arial, sans-serif; margin: 20px; }
+      .status-passed { color: green; font-weight: bold; }
+      .status-failed { color: red; font-weight: bold; }
+      table { border-collapse: collapse; width: 100%; margin: 10px 0; }
+      th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
+      th { background-color: #f2f2f2; }
+      pre { background: #f5f5f5; padding: 10px; overflow-x: auto; }
+    </style>
+  </head>
+  <body>
+    <h1>Integration Test Report</h1>
+    <p><strong>Test Run ID:</strong> {{ testRunId }}</p>
+    <p><strong>Service:</strong> {{ serviceName }}</p>
+    <p><strong>Status:</strong> <span class="status-{{ runStatus }}">{{ runStatus }}</span></p>
+    <p><strong>Started At:</strong> {{ startedAt }}</p>
+    <p><strong>Verified At:</strong> {{ verifiedAt }}</p>
+    <p><strong>Generated At:</strong> {{ generatedAt }}</p>
+
+    <h2>Summary</h2>
+    <ul>
+      <li><strong>Total Expected:</strong> {{ totalExpected }}</li>
+      <li><strong>Matched:</strong> {{ matchedCount }}</li>
+      <li><strong>Missing:</strong> {{ missingCount }}</li>
+      <li><strong>Unexpected:</strong> {{ unexpectedCount }}</li>
+    </ul>
+
+    <h2>Matched Events</h2>
+    {{ matchedEventsTable }}
+
+    <h2>Missing Events</h2>
+    {{ missingEventsTable }}
+
+    <h2>Unexpected Events</h2>
+    {{ unexpectedEventsTable }}
+
+    <h2>Verify Result (Raw)</h2>
+    <pre>{{ verifyResultJson }}</pre>
+  </body>
+</html>
+"""
+
+# Only the attributes each report table renders. "source" and "status" are
+# reserved words, so the projections and the status filter use placeholders.
+# Matched and unexpected events share one Query, so theirs also carries status.
+EVENT_PROJECTION = (
+    "expectedOrder, detailType, #src, eventId, receivedAt, verifierAt, #s"
+)
+MISSING_PROJECTION = "expectedOrder, detailType, #src, expectedEvent, verifierAt"
+EXPRESSION_NAMES = {"#src": "source", "#s": "status"}
+
+
+def _json_default(obj: Any) -> Any:
+    """DynamoDB returns numbers as Decimal; render them as plain JSON numbers."""
+    if isinstance(obj, Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _to_json(obj: Any) -> str:
+    """
+    Pretty-printed JSON for display in the report. DynamoDB numbers can be wider
+    than orjson's 64-bit range; json_utils falls back to stdlib json for those.
+    """
+    return json_utils.dumps(obj, indent=True, default=_json_default).decode("utf-8")
 
 
 def _safe_timestamp_filename(dt: datetime) -> str:
@@ -55,12 +146,27 @@ def _load_template() -> str:
     """
     Try to load HTML template from S3.
     If it doesn't exist, return a very simple fallback template.
+
+    The template is cached per warm container and revalidated with its ETag,
+    so an unchanged template costs a 304 instead of a full download.
     """
+    cached_etag = _template_cache["etag"]
     try:
-        resp = s3_client.get_object(Bucket=S3_BUCKET, Key=TEMPLATE_KEY)
+        if cached_etag:
+            resp = s3_client.get_object(
+                Bucket=S3_BUCKET, Key=TEMPLATE_KEY, IfNoneMatch=cached_etag
+            )
+        else:
+            resp = s3_client.get_object(Bucket=S3_BUCKET, Key=TEMPLATE_KEY)
         body = resp["Body"].read().decode("utf-8")
+        _template_cache.update(body=body, etag=resp.get("ETag"))
         return body
     except ClientError as e:
+        status = e.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+        if cached_etag and status == 304:
+            return _template_cache["body"]
+
+        _template_cache.update(body=None, etag=None)
         code = e.response.get("Error", {}).get("Code")
         if code not in ("NoSuchKey", "NoSuchBucket"):
             logger.error("Failed to load report template: %s", e)
@@ -71,101 +177,100 @@ def _load_template() -> str:
             TEMPLATE_KEY,
             S3_BUCKET,
         )
-        # Simple fallback template with placeholders
-        return """
-        <html>
-          <head>
-            <title>Integration Test Report - {{ testRunId }}</title>
-            <style>
-              body { font-family: Arial, sans-serif; margin: 20px; }
-              .status-passed { color: green; font-weight: bold; }
-              .status-failed { color: red; font-weight: bold; }
-              table { border-collapse: collapse; width: 100%; margin: 10px 0; }
-              th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
-              th { background-color: #f2f2f2; }
-              pre { background: #f5f5f5; padding: 10px; overflow-x: auto; }
-            </style>
-          </head>
-          <body>
-            <h1>Integration Test Report</h1>
-            <p><strong>Test Run ID:</strong> {{ testRunId }}</p>
-            <p><strong>Service:</strong> {{ serviceName }}</p>
-            <p><strong>Status:</strong> <span class="status-{{ runStatus }}">{{ runStatus }}</span></p>
-            <p><strong>Started At:</strong> {{ startedAt }}</p>
-            <p><strong>Verified At:</strong> {{ verifiedAt }}</p>
-            <p><strong>Generated At:</strong> {{ generatedAt }}</p>
-
-            <h2>Summary</h2>
-            <ul>
-              <li><strong>Total Expected:</strong> {{ totalExpected }}</li>
-              <li><strong>Matched:</strong> {{ matchedCount }}</li>
-              <li><strong>Missing:</strong> {{ missingCount }}</li>
-              <li><strong>Unexpected:</strong> {{ unexpectedCount }}</li>
-            </ul>
-
-            <h2>Matched Events</h2>
-            {{ matchedEventsTable }}
-
-            <h2>Missing Events</h2>
-            {{ missingEventsTable }}
-
-            <h2>Unexpected Events</h2>
-            {{ unexpectedEventsTable }}
-
-            <h2>Verify Result (Raw)</h2>
-            <pre>{{ verifyResultJson }}</pre>
-          </body>
-        </html>
-        """
+        return _FALLBACK_TEMPLATE
 
 
 def _render_template(template: str, context: Dict[str, Any]) -> str:
     """
     Very naive templating: replace {{ key }} with stringified value.
-    For anything more complex, you can bring in Jinja2 via your deps layer.
+    All placeholders are substituted in one regex pass over the template;
+    keys missing from the context are left as-is.
     """
-    html = template
-    for key, value in context.items():
-        placeholder = "{{ " + key + " }}"
+
+    def _substitute(match: re.Match) -> str:
+        key = match.group(1)
+        if key not in context:
+            return match.group(0)
+        value = context[key]
         # Convert dicts/lists to formatted JSON strings
         if isinstance(value, (dict, list)):
-            value = json.dumps(value, indent=2)
-        html = html.replace(placeholder, str(value))
-    return html
+            value = _to_json(value)
+        return str(value)
+
+    return _PLACEHOLDER_RE.sub(_substitute, template)
+
 
+def _from_ddb(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: _deserializer.deserialize(v) for k, v in item.items()}
 
-def _get_run_meta(test_run_id: str) -> Dict[str, Any]:
+
+def _run_pk(test_run_id: str) -> str:
+    """Partition key shared by every item of a run."""
+    return f"run#{test_run_id}"
+
+
+def _run_meta_key(pk: str) -> Dict[str, Any]:
+    return {"testId": {"S": pk}, "sk": {"S": "run#meta"}}
+
+
+def _get_run_meta(pk: str) -> Dict[str, Any]:
     """Get run meta from DynamoDB."""
-    resp = table.get_item(Key={"testId": f"run#{test_run_id}", "sk": "run#meta"})
-    return resp.get("Item", {})
+    resp = ddb.get_item(TableName=TABLE_NAME, Key=_run_meta_key(pk))
+    return _from_ddb(resp.get("Item", {}))
 
 
-def _get_matched_events(test_run_id: str) -> List[Dict[str, Any]]:
-    """Get all matched events (status=matched) for this run."""
+def _query_events(
+    pk: str, sk_prefix: str, statuses: List[str], projection: str
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield every item under sk_prefix whose status is one of statuses, following
+    LastEvaluatedKey across pages. A single call stops at 1 MB read, before
+    FilterExpression is applied.
+    """
+    status_values = {f":s{i}": {"S": status} for i, status in enumerate(statuses)}
+    paginator = ddb.get_paginator("query")
+    pages = paginator.paginate(
+        TableName=TABLE_NAME,
+        KeyConditionExpression="testId = :pk AND begins_with(sk, :prefix)",
+        FilterExpression=f"#s IN ({', '.join(status_values)})",
+        ProjectionExpression=projection,
+        ExpressionAttributeNames=EXPRESSION_NAMES,
+        ExpressionAttributeValues={
+            ":pk": {"S": pk},
+            ":prefix": {"S": sk_prefix},
+            **status_values,
+        },
+    )
+    for page in pages:
+        for item in page.get("Items", []):
+            yield _from_ddb(item)
+
+
+def _get_event_items(pk: str, statuses: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Get all event# items with the given statuses (matched and/or unexpected)
+    in one Query, bucketed by status.
+    """
+    buckets: Dict[str, List[Dict[str, Any]]] = {status: [] for status in statuses}
     try:
-        resp = table.query(
-            KeyConditionExpression=Key("testId").eq(f"run#{test_run_id}")
-            & Key("sk").begins_with("event#"),
-            FilterExpression=Attr("status").eq("matched"),
-        )
-        items = resp.get("Items", [])
-        # Sort by expectedOrder
-        items.sort(key=lambda x: x.get("expectedOrder", 999))
-        return items
+        for item in _query_events(pk, "event#", statuses, EVENT_PROJECTION):
+            buckets[item["status"]].append(item)
     except Exception as e:
-        logger.error(f"Failed to query matched events: {e}")
-        return []
+        logger.error(f"Failed to query events: {e}")
+        return {status: [] for status in statuses}
 
+    # Matched by expectedOrder, unexpected by receivedAt
+    if "matched" in buckets:
+        buckets["matched"].sort(key=lambda x: x.get("expectedOrder", 999))
+    if "unexpected" in buckets:
+        buckets["unexpected"].sort(key=lambda x: x.get("receivedAt", ""))
+    return buckets
 
-def _get_missing_events(test_run_id: str) -> List[Dict[str, Any]]:
+
+def _get_missing_events(pk: str) -> List[Dict[str, Any]]:
     """Get all missing events (expectation#*-missing) for this run."""
     try:
-        resp = table.query(
-            KeyConditionExpression=Key("testId").eq(f"run#{test_run_id}")
-            & Key("sk").begins_with("expectation#"),
-            FilterExpression=Attr("status").eq("missed"),
-        )
-        items = resp.get("Items", [])
+        items = list(_query_events(pk, "expectation#", ["missed"], MISSING_PROJECTION))
         # Sort by expectedOrder
         items.sort(key=lambda x: x.get("expectedOrder", 999))
         return items
@@ -174,21 +279,69 @@ def _get_missing_events(test_run_id: str) -> List[Dict[str, Any]]:
         return []
 
 
-def _get_unexpected_events(test_run_id: str) -> List[Dict[str, Any]]:
-    """Get all unexpected events (status=unexpected) for this run."""
-    try:
-        resp = table.query(
-            KeyConditionExpression=Key("testId").eq(f"run#{test_run_id}")
-            & Key("sk").begins_with("event#"),
-            FilterExpression=Attr("status").eq("unexpected"),
-        )
-        items = resp.get("Items", [])
-        # Sort by receivedAt
-        items.sort(key=lambda x: x.get("receivedAt", ""))
-        return items
-    except Exception as e:
-        logger.error(f"Failed to query unexpected events: {e}")
-        return []
+_MATCHED_HEADER = "<th>Order</th><th>Detail Type</th><th>Source</th><th>Event ID</th><th>Received At</th><th>Verifier At</th>"
+_MISSING_HEADER = "<th>Order</th><th>Detail Type</th><th>Source</th><th>Expected Event</th><th>Verifier At</th>"
+_UNEXPECTED_HEADER = (
+    "<th>Detail Type</th><th>Source</th><th>Event ID</th><th>Received At</th>"
+)
+
+_MATCHED_ROW = (
+    "<tr><td>{}</td><td>{}</td><td>{}</td><td>{}</td><td>{}</td><td>{}</td></tr>"
+)
+_MISSING_ROW = (
+    "<tr><td>{}</td><td>{}</td><td>{}</td><td><pre>{}</pre></td><td>{}</td></tr>"
+)
+_UNEXPECTED_ROW = "<tr><td>{}</td><td>{}</td><td>{}</td><td>{}</td></tr>"
+
+
+def _resolved(value: Any) -> Future:
+    """An already-completed future, for reads the verdict shows are unneeded."""
+    future: Future = Future()
+    future.set_result(value)
+    return future
+
+
+def _cell(event: Dict[str, Any], key: str) -> str:
+    """HTML-escaped table cell text; values come from events under test."""
+    return escape(str(event.get(key, "N/A")))
+
+
+def _matched_row(event: Dict[str, Any]) -> str:
+    return _MATCHED_ROW.format(
+        _cell(event, "expectedOrder"),
+        _cell(event, "detailType"),
+        _cell(event, "source"),
+        _cell(event, "eventId"),
+        _cell(event, "receivedAt"),
+        _cell(event, "verifierAt"),
+    )
+
+
+def _missing_row(event: Dict[str, Any]) -> str:
+    return _MISSING_ROW.format(
+        _cell(event, "expectedOrder"),
+        _cell(event, "detailType"),
+        _cell(event, "source"),
+        escape(_to_json(event.get("expectedEvent", {}))),
+        _cell(event, "verifierAt"),
+    )
+
+
+def _unexpected_row(event: Dict[str, Any]) -> str:
+    return _UNEXPECTED_ROW.format(
+        _cell(event, "detailType"),
+        _cell(event, "source"),
+        _cell(event, "eventId"),
+        _cell(event, "receivedAt"),
+    )
+
+
+# Header and row formatter per table, picked once rather than per row
+_TABLE_FORMATS = {
+    "matched": (_MATCHED_HEADER, _matched_row),
+    "missing": (_MISSING_HEADER, _missing_row),
+    "unexpected": (_UNEXPECTED_HEADER, _unexpected_row),
+}
 
 
 def _format_events_table(events: List[Dict[str, Any]], event_type: str) -> str:
@@ -196,40 +349,11 @@ def _format_events_table(events: List[Dict[str, Any]], event_type: str) -> str:
     if not events:
         return f"<p>No {event_type} events.</p>"
 
-    html = "<table><tr>"
-    if event_type == "matched":
-        html += "<th>Order</th><th>Detail Type</th><th>Source</th><th>Event ID</th><th>Received At</th><th>Verifier At</th>"
-    elif event_type == "missing":
-        html += "<th>Order</th><th>Detail Type</th><th>Source</th><th>Expected Event</th><th>Verifier At</th>"
-    else:  # unexpected
-        html += "<th>Detail Type</th><th>Source</th><th>Event ID</th><th>Received At</th>"
-    html += "</tr>"
-
-    for event in events:
-        html += "<tr>"
-        if event_type == "matched":
-            html += f"<td>{event.get('expectedOrder', 'N/A')}</td>"
-            html += f"<td>{event.get('detailType', 'N/A')}</td>"
-            html += f"<td>{event.get('source', 'N/A')}</td>"
-            html += f"<td>{event.get('eventId', 'N/A')}</td>"
-            html += f"<td>{event.get('receivedAt', 'N/A')}</td>"
-            html += f"<td>{event.get('verifierAt', 'N/A')}</td>"
-        elif event_type == "missing":
-            html += f"<td>{event.get('expectedOrder', 'N/A')}</td>"
-            html += f"<td>{event.get('detailType', 'N/A')}</td>"
-            html += f"<td>{event.get('source', 'N/A')}</td>"
-            expected = event.get("expectedEvent", {})
-            html += f"<td><pre>{json.dumps(expected, indent=2)}</pre></td>"
-            html += f"<td>{event.get('verifierAt', 'N/A')}</td>"
-        else:  # unexpected
-            html += f"<td>{event.get('detailType', 'N/A')}</td>"
-            html += f"<td>{event.get('source', 'N/A')}</td>"
-            html += f"<td>{event.get('eventId', 'N/A')}</td>"
-            html += f"<td>{event.get('receivedAt', 'N/A')}</td>"
-        html += "</tr>"
-
-    html += "</table>"
-    return html
+    header, format_row = _TABLE_FORMATS[event_type]
+    parts = ["<table><tr>", header, "</tr>"]
+    parts.extend(map(format_row, events))
+    parts.append("</table>")
+    return "".join(parts)
 
 
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -248,16 +372,42 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
     verify_result = event.get("verifyResult", {})
 
+    # Issue all reads up front; each is a separate network round trip
+    pk = _run_pk(test_run_id)
+    meta_future = _executor.submit(_get_run_meta, pk)
+    # Skip any kind the Verifier already counted as zero, so a passing run
+    # never queries for missing or unexpected events
+    event_statuses = [
+        status
+        for status, count_key in (
+            ("matched", "matchedCount"),
+            ("unexpected", "unexpectedCount"),
+        )
+        if verify_result.get(count_key) != 0
+    ]
+    events_future = (
+        _executor.submit(_get_event_items, pk, event_statuses)
+        if event_statuses
+        else _resolved({})
+    )
+    missing_future = (
+        _executor.submit(_get_missing_events, pk)
+        if verify_result.get("missingCount") != 0
+        else _resolved([])
+    )
+    template_future = _executor.submit(_load_template)
+
     # Load run meta to get additional details
-    run_meta = _get_run_meta(test_run_id)
+    run_meta = meta_future.result()
     service_name = run_meta.get("serviceName") or event.get("serviceName", "all")
     started_at = run_meta.get("startedAt", "")
     verified_at = run_meta.get("verifiedAt", "")
 
     # Get detailed event information from DynamoDB
-    matched_events = _get_matched_events(test_run_id)
-    missing_events = _get_missing_events(test_run_id)
-    unexpected_events = _get_unexpected_events(test_run_id)
+    events_by_status = events_future.result()
+    matched_events = events_by_status.get("matched", [])
+    unexpected_events = events_by_status.get("unexpected", [])
+    missing_events = missing_future.result()
 
     now = datetime.now(timezone.utc)
     ts_for_filename = _safe_timestamp_filename(now)
@@ -280,7 +430,7 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         key,
     )
 
-    template = _load_template()
+    template = template_future.result()
 
     # Format event tables
     matched_table = _format_events_table(matched_events, "matched")
@@ -293,7 +443,8 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     unexpected_count = verify_result.get("unexpectedCount", 0)
     total_expected = verify_result.get("totalExpected", 0)
 
-    context = {
+    # Plain values are escaped here; the event tables are already safe HTML
+    values = {
         "testRunId": test_run_id,
         "serviceName": service_name,
         "runStatus": run_status,
@@ -304,27 +455,36 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         "matchedCount": matched_count,
         "missingCount": missing_count,
         "unexpectedCount": unexpected_count,
-        "matchedEventsTable": matched_table,
-        "missingEventsTable": missing_table,
-        "unexpectedEventsTable": unexpected_table,
-        "verifyResultJson": json.dumps(verify_result, indent=2),
+        "verifyResultJson": _to_json(verify_result),
     }
+    context = {key: escape(str(value)) for key, value in values.items()}
+    context.update(
+        {
+            "matchedEventsTable": matched_table,
+            "missingEventsTable": missing_table,
+            "unexpectedEventsTable": unexpected_table,
+        }
+    )
 
     html = _render_template(template, context)
 
     s3_client.put_object(
         Bucket=S3_BUCKET,
         Key=key,
-        Body=html.encode("utf-8"),
-        ContentType="text/html",
+        Body=gzip.compress(html.encode("utf-8")),
+        ContentType="text/html; charset=utf-8",
+        ContentEncoding="gzip",
+        # Each report key is unique to a run and never rewritten
+        CacheControl="private, max-age=31536000, immutable",
     )
 
     # Update run meta with reportS3Key
     try:
-        table.update_item(
-            Key={"testId": f"run#{test_run_id}", "sk": "run#meta"},
+        ddb.update_item(
+            TableName=TABLE_NAME,
+            Key=_run_meta_key(pk),
             UpdateExpression="SET reportS3Key = :key",
-            ExpressionAttributeValues={":key": key},
+            ExpressionAttributeValues={":key": {"S": key}},
         )
         logger.info(f"Updated run meta with reportS3Key: {key}")
     except Exception as e:
@@ -3,11 +3,17 @@ import logging
 from typing import Any, Dict
 
 import boto3
+from botocore.config import Config
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-events_client = boto3.client("events")
+# Keep-alive lets the disable call reuse the connection the enable call opened
+# when both land on the same warm container
+events_client = boto3.client(
+    "events",
+    config=Config(tcp_keepalive=True, retries={"mode": "standard", "max_attempts": 3}),
+)
 
 RULE_NAME = os.environ["RULE_NAME"]
 EVENT_BUS_NAME = os.environ["EVENT_BUS_NAME"]
@@ -8,35 +8,47 @@ Seeder Lambda Function
 """
 
 import os
-import json
 import logging
 from typing import Optional, List, Dict, Any, Tuple
+import random
 import uuid
 from datetime import datetime, timedelta, timezone
 import time
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+import json_utils
+
 TABLE_NAME = os.environ["TABLE_NAME"]
 EVENT_BUS_NAME = os.environ["EVENT_BUS_NAME"]
 S3_BUCKET = os.environ["S3_BUCKET"]
 
-dynamodb = boto3.resource("dynamodb")
-table = dynamodb.Table(TABLE_NAME)
-events_client = boto3.client("events")
-s3_client = boto3.client("s3")
+# Keep-alive avoids a fresh TLS handshake per call on warm containers
+_client_config = Config(
+    tcp_keepalive=True,
+    max_pool_connections=10,
+    retries={"mode": "standard", "max_attempts": 3},
+)
+ddb = boto3.client("dynamodb", config=_client_config)
+events_client = boto3.client("events", config=_client_config)
+s3_client = boto3.client("s3", config=_client_config)
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Per-entry PutEvents failures worth retrying; anything else fails the run
+RETRYABLE_PUT_EVENTS_ERRORS = ("ThrottlingException", "InternalFailure")
+PUT_EVENTS_MAX_RETRIES = 5
+PUT_EVENTS_BACKOFF_CAP_SECONDS = 5.0
 
-def _now_iso() -> str:
-    return (
-        datetime.now(tz=timezone.utc)
-        .isoformat(timespec="seconds")
-        .replace("+00:00", "Z")
-    )
+# Parsed seed files and their ETags by S3 key, kept across warm invocations
+_seed_cache: Dict[str, Tuple[str, List[Dict[str, Any]]]] = {}
+
+
+def _iso_z(dt: datetime) -> str:
+    return dt.isoformat(timespec="seconds").replace("+00:00", "Z")
 
 
 def _resolve_service_name(raw_service_name: Optional[str]) -> str:
@@ -68,13 +80,29 @@ def _load_s3_json_list(bucket: str, key: str) -> List[Dict[str, Any]]:
     """
     Load JSON from S3 and ensure it's a list.
     If the object does not exist, raise ClientError with NoSuchKey.
+
+    Parsed files are cached per warm container and revalidated with their
+    ETag, so an unchanged seed file costs a 304 instead of a download + parse.
+    Callers must not mutate the returned list or its items.
     """
     logger.info("Loading seed data from s3://%s/%s", bucket, key)
-    resp = s3_client.get_object(Bucket=bucket, Key=key)
-    raw = resp["Body"].read().decode("utf-8")
-    data = json.loads(raw)
+    cached = _seed_cache.get(key)
+    try:
+        if cached:
+            resp = s3_client.get_object(Bucket=bucket, Key=key, IfNoneMatch=cached[0])
+        else:
+            resp = s3_client.get_object(Bucket=bucket, Key=key)
+    except ClientError as e:
+        status = e.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+        if cached and status == 304:
+            return cached[1]
+        _seed_cache.pop(key, None)
+        raise
+
+    data = json_utils.loads(resp["Body"].read())
 
     if isinstance(data, list):
+        _seed_cache[key] = (resp.get("ETag"), data)
         return data
     else:
         logger.error("Expected a JSON array in %s but got %s", key, type(data))
@@ -112,6 +140,82 @@ def _load_service_seed_definitions(
         return events, "all"
 
 
+def _build_event_entry(
+    idx: int,
+    ev: Dict[str, Any],
+    test_run_id: str,
+    service_name: str,
+) -> Dict[str, str]:
+    """
+    Build the PutEvents entry for seed event idx, injecting test tracing fields
+    into its detail when __injectTestId is set.
+    """
+    # Extract source and detail-type (handle both lowercase and capitalized)
+    source = ev.get("source") or ev.get("Source")
+    detail_type = ev.get("detail-type") or ev.get("DetailType") or ev.get("detailType")
+
+    if not source:
+        logger.error("Event %d missing 'source' or 'Source' field", idx + 1)
+        raise ValueError(f"Event {idx + 1} must have a 'source' field")
+    if not detail_type:
+        logger.error("Event %d missing 'detail-type' or 'DetailType' field", idx + 1)
+        raise ValueError(f"Event {idx + 1} must have a 'detail-type' field")
+
+    # Extract detail (handle both lowercase and capitalized)
+    detail = ev.get("detail") or ev.get("Detail", {})
+
+    # If detail is not a dict, wrap it or use as-is
+    if not isinstance(detail, dict):
+        detail = {"data": detail}
+
+    # Inject test tracing fields if __injectTestId is True. Copy first so they
+    # don't leak into the cached seed definitions.
+    inject_test_id = ev.get("__injectTestId", False)
+    if inject_test_id:
+        detail = dict(detail)
+        detail.setdefault("testRunId", test_run_id)
+        detail.setdefault("serviceName", service_name)
+        detail.setdefault("testMode", True)
+
+    return {
+        "EventBusName": EVENT_BUS_NAME,
+        "Source": source,
+        "DetailType": detail_type,
+        "Detail": json_utils.dumps(detail).decode("utf-8"),
+    }
+
+
+def _put_event(idx: int, entry: Dict[str, str]) -> None:
+    """
+    Publish one entry. PutEvents reports per-entry failures in a 200 response,
+    which botocore does not retry, so throttled/internal failures are retried
+    here with jittered exponential backoff.
+    """
+    for attempt in range(PUT_EVENTS_MAX_RETRIES + 1):
+        resp = events_client.put_events(Entries=[entry])
+        if not resp.get("FailedEntryCount", 0):
+            return
+
+        error_code = resp.get("Entries", [{}])[0].get("ErrorCode")
+        if error_code not in RETRYABLE_PUT_EVENTS_ERRORS:
+            break
+        if attempt == PUT_EVENTS_MAX_RETRIES:
+            break
+
+        delay = min(PUT_EVENTS_BACKOFF_CAP_SECONDS, 0.1 * 2**attempt)
+        delay += random.uniform(0, 0.1)
+        logger.warning(
+            "Test event %d failed with %s, retrying in %.2fs",
+            idx + 1,
+            error_code,
+            delay,
+        )
+        time.sleep(delay)
+
+    logger.error("Failed to publish test event %d: %s", idx + 1, resp)
+    raise RuntimeError("One or more events failed to publish")
+
+
 def _publish_test_events(
     test_run_id: str,
     service_name: str,
@@ -131,67 +235,35 @@ def _publish_test_events(
     }
 
     Supports both lowercase (new format) and capitalized (legacy) field names.
+    All entries are built and validated before the first one is published.
     """
     if not events_definitions:
         logger.info("No events to publish for serviceName=%s", service_name)
         return 0
 
+    entries = [
+        _build_event_entry(idx, ev, test_run_id, service_name)
+        for idx, ev in enumerate(events_definitions)
+    ]
     published_count = 0
 
-    for idx, ev in enumerate(events_definitions):
-        # Extract source and detail-type (handle both lowercase and capitalized)
-        source = ev.get("source") or ev.get("Source")
-        detail_type = ev.get("detail-type") or ev.get("DetailType") or ev.get("detailType")
-
-        if not source:
-            logger.error("Event %d missing 'source' or 'Source' field", idx + 1)
-            raise ValueError(f"Event {idx + 1} must have a 'source' field")
-        if not detail_type:
-            logger.error("Event %d missing 'detail-type' or 'DetailType' field", idx + 1)
-            raise ValueError(f"Event {idx + 1} must have a 'detail-type' field")
-
-        # Extract detail (handle both lowercase and capitalized)
-        detail = ev.get("detail") or ev.get("Detail", {})
-
-        # If detail is not a dict, wrap it or use as-is
-        if not isinstance(detail, dict):
-            detail = {"data": detail}
-
-        # Inject test tracing fields if __injectTestId is True
-        inject_test_id = ev.get("__injectTestId", False)
-        if inject_test_id:
-            detail.setdefault("testRunId", test_run_id)
-            detail.setdefault("serviceName", service_name)
-            detail.setdefault("testMode", True)
-
-        entry = {
-            "EventBusName": EVENT_BUS_NAME,
-            "Source": source,
-            "DetailType": detail_type,
-            "Detail": json.dumps(detail),
-        }
-
+    for idx, entry in enumerate(entries):
         logger.info(
             "Publishing test event %d/%d for testRunId=%s, serviceName=%s (source=%s, detailType=%s)",
             idx + 1,
-            len(events_definitions),
+            len(entries),
             test_run_id,
             service_name,
-            source,
-            detail_type,
+            entry["Source"],
+            entry["DetailType"],
         )
 
-        resp = events_client.put_events(Entries=[entry])
-        failed = resp.get("FailedEntryCount", 0)
-        if failed:
-            logger.error("Failed to publish test event %d: %s", idx + 1, resp)
-            raise RuntimeError("One or more events failed to publish")
-
+        _put_event(idx, entry)
         published_count += 1
 
         # If there are more events to send, wait 1 second to simulate
         # a realistic emission interval.
-        if idx < len(events_definitions) - 1:
+        if idx < len(entries) - 1:
             logger.info("Sleeping 1 second before publishing next test event")
             time.sleep(1)
 
@@ -217,7 +289,7 @@ def handler(event, context):
     - Create run#meta item
     - Emit seed events to EventBridge (testMode=true, testId=runId)
     """
-    print(f"[Seeder] Event: {json.dumps(event)}")
+    print(f"[Seeder] Event: {json_utils.dumps(event, default=str).decode()}")
 
     # You can also derive testRunId from event if you prefer something deterministic
     test_run_id = f"it-{uuid.uuid4()}"
@@ -243,28 +315,29 @@ def handler(event, context):
         )
         raise
 
-    published_count = _publish_test_events(
-        test_run_id, effective_service_name, events_defs
-    )
-
     now = datetime.now(tz=timezone.utc)
-    started_at = _now_iso()
-    timeout_at = (now + timedelta(minutes=15)).isoformat(timespec="seconds") + "Z"
+    started_at = _iso_z(now)
+    timeout_at = _iso_z(now + timedelta(minutes=15))
 
-    # 2. Create run meta item
+    # 1. Create run meta item. This must land before the first event: the
+    # Collector drops events for runs it has no meta for.
+    # Fixed shape, so the AttributeValues are written out directly
     meta_item = {
-        "testId": f"run#{test_run_id}",
-        "sk": "run#meta",
-        "runId": test_run_id,
-        "serviceName": effective_service_name,
-        "observedCount": 0,
-        "status": "running",
-        "startedAt": started_at,
-        "timeoutAt": timeout_at,
+        "testId": {"S": f"run#{test_run_id}"},
+        "sk": {"S": "run#meta"},
+        "runId": {"S": test_run_id},
+        "serviceName": {"S": effective_service_name},
+        "observedCount": {"N": "0"},
+        "status": {"S": "running"},
+        "startedAt": {"S": started_at},
+        "timeoutAt": {"S": timeout_at},
     }
-    table.put_item(Item=meta_item)
+    ddb.put_item(TableName=TABLE_NAME, Item=meta_item)
     print(f"[Seeder] Created run meta for {test_run_id}")
 
+    # 2. Emit seed events
+    _publish_test_events(test_run_id, effective_service_name, events_defs)
+
     return {
         "testRunId": test_run_id,
         "serviceName": effective_service_name,
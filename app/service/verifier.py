@@ -17,106 +17,269 @@ Status mode (called repeatedly by Step Functions):
 
 Verify mode (called once when ready/timeout):
   - Loads expectations.json from S3
+  - Queries DynamoDB once for all of the run's observed events and groups them
+    by (detailType, source)
   - For each expected event:
-    - Queries DynamoDB for matching events (testRunId, detailType, source)
-    - Downloads event body from S3 if found
+    - Downloads candidate event bodies from S3 (concurrently, each at most once)
     - Applies match rules based on expectation.__match.fields
-    - Writes match info (status=matched, verifierAt) or missing info (status=missed)
-  - Checks event order
-  - Checks for unexpected events (more events than expected)
+    - Records match info (status=matched, verifierAt) or missing info (status=missed)
+  - Marks observed events not matched to any expectation as unexpected
+  - Writes missing items with BatchWriteItem and matched/unexpected updates as
+    concurrent UpdateItem calls
   - Updates run meta status to passed/failed
 """
 
-import json
+import gzip
 import os
-from collections import Counter
+import time
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Dict, Any, List, Optional
+from decimal import Decimal
+from typing import Dict, Any, List, Optional, Tuple
 
 import boto3
-from boto3.dynamodb.conditions import Key, Attr
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+import json_utils
+
 TABLE_NAME = os.environ["TABLE_NAME"]
 S3_BUCKET = os.environ["S3_BUCKET"]
 
-dynamodb = boto3.resource("dynamodb")
-table = dynamodb.Table(TABLE_NAME)
-s3_client = boto3.client("s3")
+# Full invocation events are only logged when LOG_LEVEL=DEBUG
+DEBUG = os.environ.get("LOG_LEVEL", "INFO").upper() == "DEBUG"
+
+# Keep-alive avoids a fresh TLS handshake per call on warm containers
+_client_config = Config(
+    tcp_keepalive=True,
+    max_pool_connections=10,
+    retries={"mode": "standard", "max_attempts": 3},
+)
+ddb = boto3.client("dynamodb", config=_client_config)
+s3_client = boto3.client("s3", config=_client_config)
+
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+# Observed events under a run's partition; "source" is a reserved word
+EVENTS_KEY_CONDITION = "testId = :pk AND begins_with(sk, :prefix)"
+
+# Verify mode overlaps its observed-events Query with the run meta read and fans
+# its S3 downloads and UpdateItem calls out over this pool. Status mode doesn't
+# use it: observedCount comes from the run meta GetItem, with no count query.
+_executor = ThreadPoolExecutor(max_workers=10)
+
+BATCH_WRITE_SIZE = 25
+BATCH_WRITE_MAX_RETRIES = 5
+
+# Parsed expectations files and their ETags by S3 key, kept across warm invocations
+_expectations_cache: Dict[str, Tuple[str, List[Dict[str, Any]]]] = {}
 
 
 def _now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat(timespec="seconds") + "Z"
+    return (
+        datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+    )
 
 
 def _parse_iso(dt_str: str):
     try:
-        if dt_str.endswith("Z"):
-            dt_str = dt_str[:-1] + "+00:00"
+        # Python 3.11+ parses a trailing "Z" natively
         return datetime.fromisoformat(dt_str)
     except Exception:
         return None
 
 
+def _from_ddb(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: _deserializer.deserialize(v) for k, v in item.items()}
+
+
+def _from_ddb_strings(item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Decode an item whose attributes are normally strings, reading "S" values
+    directly. Anything else (e.g. a NULL rawS3Key written by older Collectors)
+    goes through TypeDeserializer.
+    """
+    return {
+        k: v["S"] if "S" in v else _deserializer.deserialize(v) for k, v in item.items()
+    }
+
+
+def _decimalize(value: Any) -> Any:
+    """
+    Replace floats with Decimal so TypeSerializer accepts them. Expectations
+    keep their parsed floats for matching against event bodies and are only
+    converted on the way into DynamoDB.
+    """
+    if isinstance(value, float):
+        return Decimal(repr(value))
+    if isinstance(value, dict):
+        return {k: _decimalize(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_decimalize(v) for v in value]
+    return value
+
+
+def _to_ddb(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: _serializer.serialize(_decimalize(v)) for k, v in item.items()}
+
+
+def _item_key(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Low-level primary key of a (deserialized) table item."""
+    return {"testId": {"S": item["testId"]}, "sk": {"S": item["sk"]}}
+
+
+def _events_key_values(test_run_id: str) -> Dict[str, Any]:
+    return {":pk": {"S": f"run#{test_run_id}"}, ":prefix": {"S": "event#"}}
+
+
 def _get_run_meta(test_run_id: str):
-    resp = table.get_item(Key={"testId": f"run#{test_run_id}", "sk": "run#meta"})
-    return resp.get("Item")
+    resp = ddb.get_item(
+        TableName=TABLE_NAME,
+        Key={"testId": {"S": f"run#{test_run_id}"}, "sk": {"S": "run#meta"}},
+    )
+    item = resp.get("Item")
+    return _from_ddb(item) if item else None
+
+
+def _query_all(decode=_from_ddb, **kwargs) -> List[Dict[str, Any]]:
+    """
+    Query the table, following LastEvaluatedKey until the result is complete.
+    A single call stops after 1 MB read, before FilterExpression is applied.
+    """
+    items: List[Dict[str, Any]] = []
+    while True:
+        resp = ddb.query(TableName=TABLE_NAME, **kwargs)
+        items.extend(map(decode, resp.get("Items", [])))
+        last_key = resp.get("LastEvaluatedKey")
+        if not last_key:
+            return items
+        kwargs["ExclusiveStartKey"] = last_key
+
+
+def _batch_put_items(items: List[Dict[str, Any]]) -> None:
+    """
+    Put items with BatchWriteItem, 25 per request, resending UnprocessedItems
+    with exponential backoff. An item that can't be serialized is logged and
+    skipped so it doesn't cost the rest of the batch.
+    """
+    requests = []
+    for item in items:
+        try:
+            requests.append({"PutRequest": {"Item": _to_ddb(item)}})
+        except Exception as e:
+            print(f"[Verifier/Verify] Failed to serialize item {item.get('sk')}: {e}")
+
+    for start in range(0, len(requests), BATCH_WRITE_SIZE):
+        chunk = requests[start : start + BATCH_WRITE_SIZE]
+        attempt = 0
+        while chunk:
+            resp = ddb.batch_write_item(RequestItems={TABLE_NAME: chunk})
+            chunk = resp.get("UnprocessedItems", {}).get(TABLE_NAME, [])
+            if not chunk:
+                break
+            attempt += 1
+            if attempt > BATCH_WRITE_MAX_RETRIES:
+                raise RuntimeError(f"{len(chunk)} items left unprocessed")
+            time.sleep(0.05 * 2**attempt)
+
+
+def _update_items(updates: List[Dict[str, Any]]) -> None:
+    """
+    Run UpdateItem for each set of arguments concurrently. Verdict markers on
+    event items must keep the Collector's attributes, so they are updates
+    rather than BatchWriteItem puts.
+    """
+    futures = [
+        (
+            update["Key"],
+            _executor.submit(ddb.update_item, TableName=TABLE_NAME, **update),
+        )
+        for update in updates
+    ]
+    for key, future in futures:
+        try:
+            future.result()
+        except Exception as e:
+            print(f"[Verifier/Verify] Failed to update event {key}: {e}")
 
 
 def _load_s3_json_list(bucket: str, key: str) -> List[Dict[str, Any]]:
-    """Load JSON from S3 and ensure it's a list."""
+    """
+    Load JSON from S3 and ensure it's a list.
+
+    Parsed files are cached per warm container and revalidated with their
+    ETag, so each status poll pays a 304 instead of a download + parse.
+    Callers must not mutate the returned list or its items.
+    """
+    cached = _expectations_cache.get(key)
     try:
-        resp = s3_client.get_object(Bucket=bucket, Key=key)
-        raw = resp["Body"].read().decode("utf-8")
-        data = json.loads(raw)
+        if cached:
+            resp = s3_client.get_object(Bucket=bucket, Key=key, IfNoneMatch=cached[0])
+        else:
+            resp = s3_client.get_object(Bucket=bucket, Key=key)
+        data = json_utils.loads(resp["Body"].read())
         if isinstance(data, list):
+            _expectations_cache[key] = (resp.get("ETag"), data)
             return data
         else:
             raise ValueError(f"Seed file {key} must contain a JSON array")
     except ClientError as e:
+        status = e.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+        if cached and status == 304:
+            return cached[1]
+        _expectations_cache.pop(key, None)
         print(f"[Verifier] Failed to load {key} from S3: {e}")
         raise
 
 
-def _get_observed_events(
-    test_run_id: str, detail_type: str, source: str
-) -> List[Dict[str, Any]]:
+def _get_observed_events(test_run_id: str) -> List[Dict[str, Any]]:
     """
-    Query DynamoDB for observed events matching testRunId, detailType, and source.
-    Returns list of event metadata items (with rawS3Key).
+    Query DynamoDB for every observed event of this run, in received order.
+    Returns list of event metadata items (keys, detailType, source, rawS3Key).
+
+    Errors propagate: this one result feeds every expectation and the
+    unexpected-event sweep, so an empty fallback would report the whole run as
+    missing instead of failing the verify.
     """
-    try:
-        resp = table.query(
-            KeyConditionExpression=Key("testId").eq(f"run#{test_run_id}")
-            & Key("sk").begins_with("event#"),
-            FilterExpression=Attr("detailType").eq(detail_type)
-            & Attr("source").eq(source),
-        )
-        return resp.get("Items", [])
-    except Exception as e:
-        print(
-            f"[Verifier] Failed to query events for detailType={detail_type}, source={source}: {e}"
-        )
-        return []
+    return _query_all(
+        decode=_from_ddb_strings,
+        KeyConditionExpression=EVENTS_KEY_CONDITION,
+        ProjectionExpression="testId, sk, rawS3Key, detailType, #src",
+        ExpressionAttributeNames={"#src": "source"},
+        ExpressionAttributeValues=_events_key_values(test_run_id),
+    )
 
 
 def _download_event_from_s3(s3_key: str) -> Optional[Dict[str, Any]]:
-    """Download and parse event JSON from S3."""
+    """Download and parse event JSON from S3 (gzip-encoded or plain)."""
     try:
         resp = s3_client.get_object(Bucket=S3_BUCKET, Key=s3_key)
-        raw = resp["Body"].read().decode("utf-8")
-        return json.loads(raw)
+        raw = resp["Body"].read()
+        if resp.get("ContentEncoding") == "gzip":
+            raw = gzip.decompress(raw)
+        return json_utils.loads(raw)
     except Exception as e:
         print(f"[Verifier] Failed to download event from S3 key {s3_key}: {e}")
         return None
 
 
-def _get_nested_value(obj: Dict[str, Any], path: str) -> Any:
+def _split_path(path: str) -> Tuple[str, ...]:
+    """Split a dot-notation match field once, e.g. "detail.id" -> ("detail", "id")."""
+    return tuple(path.split("."))
+
+
+# Match field paths guaranteed equal by grouping observed events on (detailType, source)
+_GROUPED_PATHS = {("detail-type",), ("source",)}
+
+
+def _get_nested_value(obj: Dict[str, Any], parts: Tuple[str, ...]) -> Any:
     """
-    Get nested value from object using dot notation.
-    E.g., "detail.instrumentRunId" -> obj["detail"]["instrumentRunId"]
+    Get nested value from object using a split dot-notation path.
+    E.g., ("detail", "instrumentRunId") -> obj["detail"]["instrumentRunId"]
     """
-    parts = path.split(".")
     value = obj
     for part in parts:
         if isinstance(value, dict):
@@ -128,20 +291,36 @@ def _get_nested_value(obj: Dict[str, Any], path: str) -> Any:
     return value
 
 
+def _match_rules(
+    expected: Dict[str, Any], match_fields: List[str]
+) -> List[Tuple[Tuple[str, ...], Any]]:
+    """
+    Pair each split match field path with its expected value. Shallow paths come
+    first, so a mismatch is usually found with the fewest lookups.
+
+    detail-type and source are skipped: candidates are already grouped by the
+    detailType and source the Collector copied from the same event body.
+    """
+    paths = sorted(
+        (p for p in map(_split_path, match_fields) if p not in _GROUPED_PATHS), key=len
+    )
+    return [(parts, _get_nested_value(expected, parts)) for parts in paths]
+
+
 def _match_event(
-    expected: Dict[str, Any], observed_event_body: Dict[str, Any], match_fields: List[str]
+    observed_event_body: Dict[str, Any],
+    match_rules: List[Tuple[Tuple[str, ...], Any]],
 ) -> bool:
     """
-    Match observed event against expected event using match fields.
+    Match observed event against the (path, expected value) rules of an expectation.
     Returns True if all match fields match.
     """
-    for field_path in match_fields:
-        expected_value = _get_nested_value(expected, field_path)
-        observed_value = _get_nested_value(observed_event_body, field_path)
+    for parts, expected_value in match_rules:
+        observed_value = _get_nested_value(observed_event_body, parts)
 
         if expected_value != observed_value:
             print(
-                f"[Verifier] Field mismatch: {field_path} - expected={expected_value}, observed={observed_value}"
+                f"[Verifier] Field mismatch: {'.'.join(parts)} - expected={expected_value}, observed={observed_value}"
             )
             return False
 
@@ -152,29 +331,38 @@ def _find_matching_event(
     expected: Dict[str, Any],
     observed_events: List[Dict[str, Any]],
     match_fields: List[str],
+    downloads: Dict[str, Future],
 ) -> Optional[Dict[str, Any]]:
     """
     Find the first observed event that matches the expected event.
     Returns the matched event metadata (with rawS3Key) or None.
+
+    Candidate bodies are downloaded concurrently but checked in query order,
+    so the first match is the same as with sequential downloads. downloads maps
+    rawS3Key to its body download and is shared across expectations, so each
+    body is fetched at most once per verify.
     """
-    detail_type = expected.get("detail-type")
-    source = expected.get("source")
+    candidates = [m for m in observed_events if m.get("rawS3Key")]
+    if not candidates:
+        return None
 
-    for event_meta in observed_events:
-        s3_key = event_meta.get("rawS3Key")
-        if not s3_key:
-            continue
+    match_rules = _match_rules(expected, match_fields)
+    if not match_rules:
+        # Nothing to compare beyond detail-type and source, so skip the download
+        return candidates[0]
 
-        event_body = _download_event_from_s3(s3_key)
-        if not event_body:
-            continue
+    for event_meta in candidates:
+        s3_key = event_meta["rawS3Key"]
+        if s3_key not in downloads:
+            downloads[s3_key] = _executor.submit(_download_event_from_s3, s3_key)
 
-        # Check if detailType and source match (they should from query, but double-check)
-        if event_body.get("detail-type") != detail_type or event_body.get("source") != source:
+    for event_meta in candidates:
+        event_body = downloads[event_meta["rawS3Key"]].result()
+        if not event_body:
             continue
 
         # Apply match rules
-        if _match_event(expected, event_body, match_fields):
+        if _match_event(event_body, match_rules):
             return event_meta
 
     return None
@@ -183,6 +371,32 @@ def _find_matching_event(
 # ---------- STATUS MODE ----------
 
 
+def _set_run_status(meta: Dict[str, Any], status: str) -> None:
+    """
+    Set the run status from a status poll. The write is conditional on the run
+    still being running/ready, so a late poll cannot overwrite the outcome that
+    verify mode has recorded in the meantime.
+    """
+    try:
+        ddb.update_item(
+            TableName=TABLE_NAME,
+            Key=_item_key(meta),
+            UpdateExpression="SET #s = :status",
+            ConditionExpression="attribute_not_exists(#s) OR #s IN (:running, :ready)",
+            ExpressionAttributeNames={"#s": "status"},
+            ExpressionAttributeValues={
+                ":status": {"S": status},
+                ":running": {"S": "running"},
+                ":ready": {"S": "ready"},
+            },
+        )
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+            print(f"[Verifier/Status] Failed to set run status to {status}: {e}")
+    except Exception as e:
+        print(f"[Verifier/Status] Failed to set run status to {status}: {e}")
+
+
 def _status_mode(test_run_id: str) -> dict:
     """
     Used by Step Functions "CheckRunStatus".
@@ -211,16 +425,8 @@ def _status_mode(test_run_id: str) -> dict:
     except Exception as e:
         print(f"[Verifier/Status] Could not load expectations to get count: {e}")
 
-    # Count observed events
-    try:
-        resp = table.query(
-            KeyConditionExpression=Key("testId").eq(f"run#{test_run_id}")
-            & Key("sk").begins_with("event#")
-        )
-        observed_count = len(resp.get("Items", []))
-    except Exception as e:
-        print(f"[Verifier/Status] Could not count observed events: {e}")
-        observed_count = 0
+    # Maintained by the Collector as it stores event records
+    observed_count = int(meta.get("observedCount", 0))
 
     current_status = meta.get("status", "running")
     timeout_at_str = meta.get("timeoutAt")
@@ -231,15 +437,7 @@ def _status_mode(test_run_id: str) -> dict:
         timeout_at = _parse_iso(timeout_at_str)
         if timeout_at and now >= timeout_at:
             if current_status != "timeout":
-                try:
-                    table.update_item(
-                        Key={"testId": meta["testId"], "sk": meta["sk"]},
-                        UpdateExpression="SET #s = :timeout",
-                        ExpressionAttributeNames={"#s": "status"},
-                        ExpressionAttributeValues={":timeout": "timeout"},
-                    )
-                except Exception as e:
-                    print(f"[Verifier/Status] Failed to set run status to timeout: {e}")
+                _set_run_status(meta, "timeout")
             return {
                 "status": "timeout",
                 "runId": test_run_id,
@@ -250,15 +448,7 @@ def _status_mode(test_run_id: str) -> dict:
     # If all expected events observed -> ready
     if observed_count >= expected_count and expected_count > 0:
         if current_status != "ready":
-            try:
-                table.update_item(
-                    Key={"testId": meta["testId"], "sk": meta["sk"]},
-                    UpdateExpression="SET #s = :ready",
-                    ExpressionAttributeNames={"#s": "status"},
-                    ExpressionAttributeValues={":ready": "ready"},
-                )
-            except Exception as e:
-                print(f"[Verifier/Status] Failed to set run status to ready: {e}")
+            _set_run_status(meta, "ready")
         return {
             "status": "ready",
             "runId": test_run_id,
@@ -282,6 +472,9 @@ def _verify_mode(test_run_id: str) -> dict:
     """
     Verify mode: Load expectations, match against observed events, write results.
     """
+    # One Query serves every expectation and the unexpected-event sweep; it
+    # doesn't depend on run meta, so overlap the two reads
+    observed_future = _executor.submit(_get_observed_events, test_run_id)
     meta = _get_run_meta(test_run_id)
     if not meta:
         raise ValueError(f"No run meta found for testRunId={test_run_id}")
@@ -298,10 +491,19 @@ def _verify_mode(test_run_id: str) -> dict:
     except Exception as e:
         raise ValueError(f"Failed to load expectations from S3: {e}")
 
+    all_observed_events = observed_future.result()
+    observed_by_type = defaultdict(list)
+    for event_item in all_observed_events:
+        type_key = (event_item.get("detailType"), event_item.get("source"))
+        observed_by_type[type_key].append(event_item)
+
     verifier_at = _now_iso()
     matched_count = 0
     missing_count = 0
-    matched_event_keys = []  # Track which events were matched
+    matched_event_keys = set()  # (testId, sk) of events that were matched
+    missing_items = []
+    updates = []  # UpdateItem arguments for matched and unexpected events
+    downloads: Dict[str, Future] = {}  # Event bodies by rawS3Key, this run only
 
     # Process each expected event in order
     for idx, expected in enumerate(expectations):
@@ -313,44 +515,48 @@ def _verify_mode(test_run_id: str) -> dict:
             print(f"[Verifier/Verify] Skipping expectation {idx}: missing detail-type or source")
             continue
 
-        # Query for matching observed events
-        observed_events = _get_observed_events(test_run_id, detail_type, source)
+        # Observed events with the same detailType and source
+        observed_events = observed_by_type.get((detail_type, source), [])
 
         # Find matching event
-        matched_event = _find_matching_event(expected, observed_events, match_fields)
+        matched_event = _find_matching_event(
+            expected, observed_events, match_fields, downloads
+        )
 
         if matched_event:
             # Write match info to DynamoDB
             matched_count += 1
-            event_key = {"testId": matched_event["testId"], "sk": matched_event["sk"]}
-            matched_event_keys.append(event_key)
-
+            event_key = _item_key(matched_event)
+            matched_event_keys.add((matched_event["testId"], matched_event["sk"]))
+
+            update = {
+                "Key": event_key,
+                "UpdateExpression": "SET #s = :status, verifierAt = :verifierAt, expectedOrder = :order",
+                "ExpressionAttributeNames": {"#s": "status"},
+                "ExpressionAttributeValues": {
+                    ":status": {"S": "matched"},
+                    ":verifierAt": {"S": verifier_at},
+                    ":order": {"N": str(idx)},
+                },
+            }
+            # The match is still recorded if the expectation can't be stored
             try:
-                table.update_item(
-                    Key=event_key,
-                    UpdateExpression="SET #s = :status, verifierAt = :verifierAt, expectedOrder = :order, expectedEvent = :expected",
-                    ExpressionAttributeNames={"#s": "status"},
-                    ExpressionAttributeValues={
-                        ":status": "matched",
-                        ":verifierAt": verifier_at,
-                        ":order": idx,
-                        ":expected": expected,
-                    },
-                )
-                print(
-                    f"[Verifier/Verify] Matched expectation {idx}: detailType={detail_type}, source={source}"
-                )
+                expected_av = _serializer.serialize(_decimalize(expected))
+                update["ExpressionAttributeValues"][":expected"] = expected_av
+                update["UpdateExpression"] += ", expectedEvent = :expected"
             except Exception as e:
-                print(
-                    f"[Verifier/Verify] Failed to update matched event {event_key}: {e}"
-                )
+                print(f"[Verifier/Verify] Failed to serialize expectation {idx}: {e}")
+            updates.append(update)
+            print(
+                f"[Verifier/Verify] Matched expectation {idx}: detailType={detail_type}, source={source}"
+            )
         else:
             # Write missing event item to DynamoDB
             missing_count += 1
             missing_sk = f"expectation#{idx:03d}-missing"
 
-            try:
-                missing_item = {
+            missing_items.append(
+                {
                     "testId": f"run#{test_run_id}",
                     "sk": missing_sk,
                     "testRunId": test_run_id,
@@ -361,46 +567,37 @@ def _verify_mode(test_run_id: str) -> dict:
                     "verifierAt": verifier_at,
                     "expectedOrder": idx,
                 }
-                table.put_item(Item=missing_item)
-                print(
-                    f"[Verifier/Verify] Missing expectation {idx}: detailType={detail_type}, source={source}"
-                )
-            except Exception as e:
-                print(
-                    f"[Verifier/Verify] Failed to write missing event item: {e}"
-                )
+            )
+            print(
+                f"[Verifier/Verify] Missing expectation {idx}: detailType={detail_type}, source={source}"
+            )
 
-    # Check for unexpected events (events not matched to any expectation)
-    unexpected_count = 0
     try:
-        resp = table.query(
-            KeyConditionExpression=Key("testId").eq(f"run#{test_run_id}")
-            & Key("sk").begins_with("event#")
-        )
-        all_observed_events = resp.get("Items", [])
-
-        # Check each observed event to see if it was matched
-        for event_item in all_observed_events:
-            event_key = {"testId": event_item["testId"], "sk": event_item["sk"]}
-            if event_key not in matched_event_keys:
-                # This event was not matched to any expectation
-                unexpected_count += 1
-                try:
-                    table.update_item(
-                        Key=event_key,
-                        UpdateExpression="SET #s = :status, verifierAt = :verifierAt",
-                        ExpressionAttributeNames={"#s": "status"},
-                        ExpressionAttributeValues={
-                            ":status": "unexpected",
-                            ":verifierAt": verifier_at,
-                        },
-                    )
-                except Exception as e:
-                    print(
-                        f"[Verifier/Verify] Failed to mark event as unexpected: {e}"
-                    )
+        _batch_put_items(missing_items)
     except Exception as e:
-        print(f"[Verifier/Verify] Failed to check for unexpected events: {e}")
+        print(f"[Verifier/Verify] Failed to write missing event items: {e}")
+
+    # Check for unexpected events (events not matched to any expectation)
+    unexpected_count = 0
+
+    # Check each observed event to see if it was matched
+    for event_item in all_observed_events:
+        if (event_item["testId"], event_item["sk"]) not in matched_event_keys:
+            # This event was not matched to any expectation
+            unexpected_count += 1
+            updates.append(
+                {
+                    "Key": _item_key(event_item),
+                    "UpdateExpression": "SET #s = :status, verifierAt = :verifierAt",
+                    "ExpressionAttributeNames": {"#s": "status"},
+                    "ExpressionAttributeValues": {
+                        ":status": {"S": "unexpected"},
+                        ":verifierAt": {"S": verifier_at},
+                    },
+                }
+            )
+
+    _update_items(updates)
 
     # Determine run status
     current_status = meta.get("status", "running")
@@ -413,11 +610,15 @@ def _verify_mode(test_run_id: str) -> dict:
 
     # Update run meta status
     try:
-        table.update_item(
-            Key={"testId": meta["testId"], "sk": meta["sk"]},
+        ddb.update_item(
+            TableName=TABLE_NAME,
+            Key=_item_key(meta),
             UpdateExpression="SET #s = :status, verifiedAt = :verifiedAt",
             ExpressionAttributeNames={"#s": "status"},
-            ExpressionAttributeValues={":status": run_status, ":verifiedAt": verifier_at},
+            ExpressionAttributeValues={
+                ":status": {"S": run_status},
+                ":verifiedAt": {"S": verifier_at},
+            },
         )
     except Exception as e:
         print(f"[Verifier/Verify] Failed to update run meta status: {e}")
@@ -453,7 +654,8 @@ def handler(event, context):
       or
       { "testRunId": "...", "mode": "verify" }
     """
-    print(f"[Verifier] Event: {json.dumps(event)}")
+    if DEBUG:
+        print(f"[Verifier] Event: {json_utils.dumps(event, default=str).decode()}")
 
     mode = event.get("mode") or "verify"
 
@@ -467,6 +669,8 @@ def handler(event, context):
     if not test_run_id:
         raise ValueError("runId or testRunId is required for verifier")
 
+    print(f"[Verifier] mode={mode} runId={test_run_id}")
+
     if mode == "status":
         return _status_mode(test_run_id)
     else:
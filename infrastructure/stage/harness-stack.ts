@@ -5,8 +5,10 @@ import { PythonFunction, PythonLayerVersion } from '@aws-cdk/aws-lambda-python-a
 import { aws_lambda, Duration, Stack } from 'aws-cdk-lib';
 import { ISecurityGroup, IVpc, SecurityGroup, Vpc, VpcLookupOptions } from 'aws-cdk-lib/aws-ec2';
 import { EventBus, IEventBus, Rule } from 'aws-cdk-lib/aws-events';
-import { LambdaFunction } from 'aws-cdk-lib/aws-events-targets';
+import { SqsQueue } from 'aws-cdk-lib/aws-events-targets';
 import { Architecture } from 'aws-cdk-lib/aws-lambda';
+import { SqsEventSource } from 'aws-cdk-lib/aws-lambda-event-sources';
+import { IQueue, Queue } from 'aws-cdk-lib/aws-sqs';
 import { ITable, Table } from 'aws-cdk-lib/aws-dynamodb';
 import { IBucket, Bucket } from 'aws-cdk-lib/aws-s3';
 import {
@@ -93,8 +95,9 @@ export class IntegrationTestsHarnessStack extends Stack {
     this.dynamoDBTable.grantReadWriteData(seeder);
     this.s3Bucket.grantRead(seeder);
 
-    // Create disabled collector rule
-    const collectorRule = this.setupCollectorEventRule(collector);
+    // Create disabled collector rule, buffered through SQS so the collector handles batches
+    const collectorQueue = this.setupCollectorQueue(collector);
+    const collectorRule = this.setupCollectorEventRule(collectorQueue);
     // RuleController Lambda
     const ruleController = this.createRuleControllerFunction();
 
@@ -145,7 +148,30 @@ export class IntegrationTestsHarnessStack extends Stack {
     });
   }
 
-  private setupCollectorEventRule(collector: PythonFunction): Rule {
+  private setupCollectorQueue(collector: PythonFunction): IQueue {
+    const deadLetterQueue = new Queue(this, 'CollectorDeadLetterQueue', {
+      enforceSSL: true,
+      retentionPeriod: Duration.days(14),
+    });
+    const queue = new Queue(this, 'CollectorQueue', {
+      enforceSSL: true,
+      // AWS recommends at least 6x the consumer function timeout
+      visibilityTimeout: Duration.seconds(300 * 6),
+      deadLetterQueue: { queue: deadLetterQueue, maxReceiveCount: 3 },
+    });
+
+    // Up to 25 events per invocation, matching the DynamoDB BatchWriteItem limit
+    collector.addEventSource(
+      new SqsEventSource(queue, {
+        batchSize: 25,
+        maxBatchingWindow: Duration.seconds(5),
+        reportBatchItemFailures: true,
+      })
+    );
+    return queue;
+  }
+
+  private setupCollectorEventRule(collectorQueue: IQueue): Rule {
     return new Rule(this, this.stackName + 'CollectorEventRule', {
       eventBus: this.mainBus,
       // rule name restriction: https://docs.aws.amazon.com/eventbridge/latest/APIReference/API_Rule.html
@@ -158,7 +184,7 @@ export class IntegrationTestsHarnessStack extends Stack {
       },
       enabled: false,
       targets: [
-        new LambdaFunction(collector, {
+        new SqsQueue(collectorQueue, {
           maxEventAge: Duration.seconds(60),
           retryAttempts: 3,
         }),
@@ -191,6 +217,8 @@ export class IntegrationTestsHarnessStack extends Stack {
       index: 'reporter.py',
       handler: 'handler',
       timeout: Duration.seconds(300),
+      // Report rendering is CPU-bound; Lambda allocates vCPU in proportion to memory
+      memorySize: 512,
     });
   }
 